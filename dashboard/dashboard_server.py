@@ -10,6 +10,8 @@ import paho.mqtt.client as mqtt
 import struct
 import threading
 import sys
+import os
+from collections import deque
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'mqtt-dashboard-secret'
@@ -21,6 +23,16 @@ MQTT_PORT = 1883
 mqtt_client = None
 mqtt_connected = False
 
+# Chunk header: block_id (2), part_num (2), total_parts (2), data_len (2)
+CHUNK_HEADER = struct.Struct('<HHHH')
+
+# Chunks and pico/block notices are queued by the MQTT callback and emitted
+# in batches; a flush task is started only when the queue goes non-empty
+CHUNK_FLUSH_INTERVAL = 0.005  # seconds
+pending_chunks = deque()
+flush_lock = threading.Lock()
+flush_scheduled = False
+
 # Block transfer state
 current_block = {
     'id': None,
@@ -60,19 +72,18 @@ def on_mqtt_message(client, userdata, msg):
     try:
         if msg.topic == "pico/chunks":
             # Parse block transfer chunk
-            if len(msg.payload) >= 8:
-                # Parse header: block_id (2), part_num (2), total_parts (2), data_len (2)
-                block_id, part_num, total_parts, data_len = struct.unpack('<HHHH', msg.payload[:8])
-                chunk_data = msg.payload[8:8+data_len]
+            if len(msg.payload) >= CHUNK_HEADER.size:
+                block_id, part_num, total_parts, data_len = CHUNK_HEADER.unpack_from(msg.payload)
+                chunk_data = msg.payload[CHUNK_HEADER.size:CHUNK_HEADER.size + data_len]
                 
-                # Send chunk to web clients
-                socketio.emit('mqtt_message', {
+                # Queue chunk for the next batch to web clients
+                queue_for_clients({
                     'topic': msg.topic,
                     'block_id': block_id,
                     'part_num': part_num,
                     'total_parts': total_parts,
                     'data_len': data_len,
-                    'data': list(chunk_data)  # Convert bytes to list for JSON
+                    'data': chunk_data  # Sent as a binary frame, arrives as an ArrayBuffer
                 })
         
         elif msg.topic == "pico/test":
@@ -84,9 +95,9 @@ def on_mqtt_message(client, userdata, msg):
             })
         
         elif msg.topic == "pico/block":
-            # Block completion notification
+            # Block completion notification - queued behind the chunks it completes
             text = msg.payload.decode('utf-8', errors='ignore')
-            socketio.emit('mqtt_message', {
+            queue_for_clients({
                 'topic': msg.topic,
                 'text': text
             })
@@ -94,6 +105,33 @@ def on_mqtt_message(client, userdata, msg):
     except Exception as e:
         print(f"❌ Error processing message: {e}")
 
+def queue_for_clients(item):
+    """Queue an item for the next batch, starting a flush if none is pending"""
+    global flush_scheduled
+    with flush_lock:
+        pending_chunks.append(item)
+        if flush_scheduled:
+            return
+        flush_scheduled = True
+    socketio.start_background_task(flush_chunks)
+
+def flush_chunks():
+    """Background task - emit everything queued in the last interval as one batch"""
+    global flush_scheduled
+    while True:
+        socketio.sleep(CHUNK_FLUSH_INTERVAL)  # let the rest of the burst queue up
+        with flush_lock:
+            if not pending_chunks:
+                # Only one flush runs at a time, so batches stay in order
+                flush_scheduled = False
+                return
+            batch = list(pending_chunks)
+            pending_chunks.clear()
+        try:
+            socketio.emit('mqtt_block_batch', batch)
+        except Exception as e:
+            print(f"❌ Error sending block batch: {e}")
+
 def start_mqtt_client():
     """Initialize and start MQTT client"""
     global mqtt_client
@@ -124,13 +162,16 @@ def handle_disconnect():
     """Client disconnected from WebSocket"""
     print('🌐 Web client disconnected')
 
+# Dashboard page - read once at startup instead of on every request
+DASHBOARD_HTML_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dashboard.html')
+with open(DASHBOARD_HTML_PATH, 'r', encoding='utf-8') as f:
+    dashboard_html = f.read()
+
 # HTTP route - serve dashboard HTML
 @app.route('/')
 def index():
     """Serve the dashboard HTML"""
-    with open('dashboard.html', 'r', encoding='utf-8') as f:
-        html_content = f.read()
-    return html_content
+    return dashboard_html
 
 if __name__ == '__main__':
     print("="*60)
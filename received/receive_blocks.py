@@ -8,6 +8,9 @@ import struct
 import os
 from datetime import datetime
 
+# Chunk header: block_id (2), part_num (2), total_parts (2), data_len (2)
+CHUNK_HEADER = struct.Struct('<HHHH')
+
 class BlockReceiver:
     def __init__(self, broker="localhost", port=1883):
         self.client = mqtt.Client()
@@ -19,7 +22,8 @@ class BlockReceiver:
         # Block state
         self.block_id = None
         self.total_parts = 0
-        self.parts = {}
+        self.parts = []  # index part_num - 1, None until received
+        self.received_parts = 0
         self.start_time = None
         
     def on_connect(self, client, userdata, flags, rc):
@@ -35,7 +39,7 @@ class BlockReceiver:
     
     def on_message(self, client, userdata, msg):
         # Handle notifications
-        if msg.topic == "pico/block" and len(msg.payload) < 8:
+        if msg.topic == "pico/block" and len(msg.payload) < CHUNK_HEADER.size:
             try:
                 notification = msg.payload.decode('utf-8', errors='ignore')
                 if "BLOCK_COMPLETE" in notification or "BLOCK_RECEIVED" in notification:
@@ -44,13 +48,13 @@ class BlockReceiver:
             except:
                 pass
         
-        if len(msg.payload) < 8:
+        if len(msg.payload) < CHUNK_HEADER.size:
             return
             
         try:
             # Parse header
-            block_id, part_num, total_parts, data_len = struct.unpack('<HHHH', msg.payload[:8])
-            chunk_data = msg.payload[8:8+data_len]
+            block_id, part_num, total_parts, data_len = CHUNK_HEADER.unpack_from(msg.payload)
+            chunk_data = memoryview(msg.payload)[CHUNK_HEADER.size:CHUNK_HEADER.size + data_len]  # view, no copy
             
             if len(chunk_data) != data_len:
                 return
@@ -61,18 +65,23 @@ class BlockReceiver:
                     print(f"⚠️  New block {block_id} started")
                 self.block_id = block_id
                 self.total_parts = total_parts
-                self.parts = {}
+                self.parts = [None] * total_parts
+                self.received_parts = 0
                 self.start_time = datetime.now()
                 print(f"\n🆕 Receiving block {block_id}: {total_parts} parts")
             
+            if not 1 <= part_num <= self.total_parts:
+                return
+            
             # Store chunk
-            if part_num not in self.parts:
-                self.parts[part_num] = chunk_data
-                if len(self.parts) % 10 == 0 or len(self.parts) == total_parts:
-                    print(f"📦 {len(self.parts)}/{total_parts} chunks")
+            if self.parts[part_num - 1] is None:
+                self.parts[part_num - 1] = chunk_data
+                self.received_parts += 1
+                if self.received_parts % 10 == 0 or self.received_parts == self.total_parts:
+                    print(f"📦 {self.received_parts}/{self.total_parts} chunks")
             
             # Complete?
-            if len(self.parts) == total_parts:
+            if self.received_parts == self.total_parts:
                 self.save_block()
         except Exception as e:
             print(f"❌ Error: {e}")
@@ -80,28 +89,27 @@ class BlockReceiver:
     def save_block(self):
         try:
             # Check for missing chunks
-            missing = [i for i in range(1, self.total_parts + 1) if i not in self.parts]
+            missing = [i for i, chunk in enumerate(self.parts, 1) if chunk is None]
             if missing:
                 print(f"❌ Missing chunks: {missing}")
                 return
             
-            # Reassemble
-            image_data = bytearray()
-            for i in range(1, self.total_parts + 1):
-                image_data.extend(self.parts[i])
+            # Chunks in order - written straight to disk, no reassembled copy
+            chunks = self.parts
+            total_size = sum(len(chunk) for chunk in chunks)
             
-            if len(image_data) == 0:
+            if total_size == 0:
                 return
             
             # Detect file type
             ext = ".bin"
-            if len(image_data) >= 2:
-                if image_data[:2] == b'\xff\xd8':
-                    ext = ".jpg"
-                elif image_data[:2] == b'\x89\x50':
-                    ext = ".png"
-                elif image_data[:2] == b'\x47\x49':
-                    ext = ".gif"
+            magic = chunks[0][:2]
+            if magic == b'\xff\xd8':
+                ext = ".jpg"
+            elif magic == b'\x89\x50':
+                ext = ".png"
+            elif magic == b'\x47\x49':
+                ext = ".gif"
             
             # Create received directory
             current_dir = os.getcwd()
@@ -117,14 +125,15 @@ class BlockReceiver:
             
             # Save to repo
             with open(filepath, 'wb') as f:
-                f.write(image_data)
+                f.writelines(chunks)
             
             elapsed = (datetime.now() - self.start_time).total_seconds()
-            print(f"💾 Saved: received/{filename} ({len(image_data)} bytes, {elapsed:.1f}s)\n")
+            print(f"💾 Saved: received/{filename} ({total_size} bytes, {elapsed:.1f}s)\n")
             
             # Reset
             self.block_id = None
-            self.parts = {}
+            self.parts = []
+            self.received_parts = 0
         except Exception as e:
             print(f"❌ Error saving: {e}")
             import traceback
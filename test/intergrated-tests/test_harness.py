@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Shared MQTT helpers for the automated integration tests
+(subscriber used by IT1/IT2, summary and socket setup used by IT1/IT2/IT5/IT8)
+"""
+
+import paho.mqtt.client as mqtt
+import socket
+import time
+import threading
+
+# Broker configuration
+BROKER = "localhost"
+PORT = 1883
+
+
+def set_tcp_nodelay(client, userdata, sock):
+    """Install as client.on_socket_open - turns off Nagle on the broker socket"""
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+
+class MqttTestRunner:
+    """
+    Subscribes to one topic and hands each test iteration the messages that
+    arrived while it was waiting
+    """
+
+    def __init__(self, topic: str, qos: int = 1, broker: str = BROKER, port: int = PORT,
+                 verbose: bool = False):
+        self.topic = topic
+        self.qos = qos
+        self.verbose = verbose  # log each received message
+        self.broker = broker
+        self.port = port
+        self.messages = []
+        self.client = mqtt.Client()
+        self.client.on_connect = self._on_connect
+        self.client.on_subscribe = self._on_subscribe
+        self.client.on_message = self._on_message
+        self.client.on_socket_open = set_tcp_nodelay
+        # Signalled by _on_subscribe / _on_message
+        self._subscribed_event = threading.Event()
+        self._message_event = threading.Event()
+
+    def start(self, timeout: float = 5) -> bool:
+        """Connect, subscribe and wait for the SUBACK"""
+        self.client.connect(self.broker, self.port, 60)
+        self.client.loop_start()
+
+        if not self._subscribed_event.wait(timeout=timeout):
+            print(f"❌ No SUBACK for {self.topic} within {timeout}s")
+            self.stop()
+            return False
+        return True
+
+    def stop(self):
+        """Stop the network loop and disconnect"""
+        self.client.loop_stop()
+        self.client.disconnect()
+
+    def wait_for_message(self, timeout: float = 10, grace: float = 0) -> list:
+        """
+        Clear previous messages and wait for the next one, then keep
+        collecting for `grace` seconds so duplicates are caught
+        Returns the messages received (empty on timeout)
+        """
+        self.messages.clear()
+        self._message_event.clear()
+        if self.messages or self._message_event.wait(timeout=timeout):
+            time.sleep(grace)
+        # Copy - the paho thread keeps appending and the next call clears the list
+        return list(self.messages)
+
+    def _on_connect(self, client, userdata, flags, rc):
+        if rc == 0:
+            print(f"✅ Connected to broker {self.broker}:{self.port}")
+            client.subscribe(self.topic, qos=self.qos)
+        else:
+            print(f"❌ Connection failed: {rc}")
+
+    def _on_subscribe(self, client, userdata, mid, granted_qos):
+        print(f"📡 Subscribed to {self.topic}")
+        self._subscribed_event.set()
+
+    def _on_message(self, client, userdata, msg):
+        # Keep the raw bytes; the checks only look at topic and QoS
+        self.messages.append({
+            'topic': msg.topic,
+            'payload': msg.payload,
+            'arrival': time.monotonic(),
+            'qos': msg.qos
+        })
+        self._message_event.set()
+        if self.verbose:
+            print(f"📩 Received: topic={msg.topic}, qos={msg.qos}, {len(msg.payload)} bytes")
+
+
+def summarize(passed: int, failed: int) -> int:
+    """
+    Print the pass/fail summary block
+    Returns the number of completed (non-skipped) tests
+    """
+    total = passed + failed
+    print("\n" + "="*60)
+    print("TEST SUMMARY")
+    print("="*60)
+    if total:
+        rate = 100.0 * passed / total
+        print(f"Passed: {passed}/{total}")
+        print(f"Failed: {failed}/{total}")
+        print(f"Success Rate: {rate:.1f}%")
+        print(f"\nTolerance: {passed} out of {total} test cases, achieved {rate:.1f}% success")
+    return total
@@ -10,18 +10,23 @@ import struct
 import time
 import sys
 import hashlib
+from test_harness import set_tcp_nodelay
 
 # Test configuration
 BROKER = "localhost"
 PORT = 1883
 TEST_RUNS = 10  # 10 block transfers (press GP21 button 10 times)
 
+# Chunk header: block_id (2), part_num (2), total_parts (2), data_len (2)
+CHUNK_HEADER = struct.Struct('<HHHH')
+
 # Test results
 test_results = []
 current_block = {
     'id': None,
     'total_parts': 0,
     'parts': {},
+    'remaining': 0,
     'start_time': None,
     'expected_checksum': None
 }
@@ -50,43 +55,50 @@ def on_message(client, userdata, msg):
         print(f"📬 {notification}")
         return
     
-    if len(msg.payload) < 8:
+    if len(msg.payload) < CHUNK_HEADER.size:
         return
     
     try:
-        # Parse header: block_id (2), part_num (2), total_parts (2), data_len (2)
-        block_id, part_num, total_parts, data_len = struct.unpack('<HHHH', msg.payload[:8])
-        chunk_data = msg.payload[8:8+data_len]
+        block_id, part_num, total_parts, data_len = CHUNK_HEADER.unpack_from(msg.payload)
+        chunk_data = memoryview(msg.payload)[CHUNK_HEADER.size:CHUNK_HEADER.size + data_len]  # view, no copy
         
         if len(chunk_data) != data_len:
             return
         
         # New block started
         if current_block['id'] != block_id:
-            if current_block['id'] is not None:
+            # Previous block still incomplete - report it (completed blocks were already checked)
+            if current_block['id'] is not None and current_block['remaining'] > 0:
                 check_block_completion()
             
             current_block = {
                 'id': block_id,
                 'total_parts': total_parts,
                 'parts': {},
-                'start_time': time.time(),
+                'remaining': total_parts,
+                'start_time': time.monotonic(),
                 'expected_checksum': None
             }
             print(f"\n🆕 Test #{len(test_results)+1}: Receiving block {block_id} ({total_parts} parts)")
         
+        # Ignore part numbers outside the block so they cannot throw off the count
+        total_parts = current_block['total_parts']
+        if not 1 <= part_num <= total_parts:
+            return
+        
         # Store chunk
         if part_num not in current_block['parts']:
             current_block['parts'][part_num] = chunk_data
-            received = len(current_block['parts'])
+            current_block['remaining'] -= 1
+            received = total_parts - current_block['remaining']
             
             if received % 10 == 0 or received == total_parts:
                 progress = (received / total_parts) * 100
                 print(f"  📦 Progress: {received}/{total_parts} ({progress:.0f}%)")
-        
-        # Check if complete
-        if len(current_block['parts']) == total_parts:
-            check_block_completion()
+            
+            # Check once, when the last missing part arrives
+            if current_block['remaining'] == 0:
+                check_block_completion()
             
     except Exception as e:
         print(f"❌ Error processing message: {e}")
@@ -118,7 +130,7 @@ def check_block_completion():
     
     # Calculate checksum
     checksum = calculate_checksum(bytes(image_data))
-    elapsed = time.time() - current_block['start_time']
+    elapsed = time.monotonic() - current_block['start_time']
     size_kb = len(image_data) / 1024
     
     # Verify file type
@@ -161,6 +173,7 @@ def run_test():
     
     client = mqtt.Client()
     client.on_connect = on_connect
+    client.on_socket_open = set_tcp_nodelay
     client.on_message = on_message
     
     try:
@@ -171,10 +184,10 @@ def run_test():
         time.sleep(2)
         
         # Run until we get enough tests or timeout
-        start_time = time.time()
+        start_time = time.monotonic()
         timeout = 600  # 10 minutes max
         
-        while len(test_results) < TEST_RUNS and (time.time() - start_time) < timeout:
+        while len(test_results) < TEST_RUNS and (time.monotonic() - start_time) < timeout:
             time.sleep(1)
         
         # Print summary
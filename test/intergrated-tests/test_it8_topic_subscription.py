@@ -7,6 +7,8 @@ Tests SUBSCRIBE -> SUBACK flow with granted QoS and topic ID
 import paho.mqtt.client as mqtt
 import time
 import sys
+import threading
+from test_harness import summarize, set_tcp_nodelay
 
 # Test configuration
 BROKER = "localhost"
@@ -21,15 +23,21 @@ test_results = []
 def on_connect(client, userdata, flags, rc):
     if rc == 0:
         print(f"✅ Connected to broker {BROKER}:{PORT}")
+        userdata['connected'].set()
     else:
         print(f"❌ Connection failed: {rc}")
         sys.exit(1)
 
 def on_subscribe(client, userdata, mid, granted_qos):
     """Callback when subscription is confirmed"""
-    timestamp = time.time()
-    userdata['subscribe_time'] = timestamp
-    userdata['granted_qos'] = granted_qos[0]
+    timestamp = time.monotonic()
+    # The test loop registers each MID under the lock; anything else is a late SUBACK
+    with userdata['lock']:
+        event = userdata['events'].get(mid)
+        if event is None:
+            return
+        userdata['acks'][mid] = (timestamp, granted_qos[0])
+    event.set()
     print(f"📡 Subscription confirmed: MID={mid}, Granted QoS={granted_qos[0]}")
 
 def run_test():
@@ -46,68 +54,71 @@ def run_test():
     passed = 0
     failed = 0
     
-    for i in range(1, TEST_RUNS + 1):
-        userdata = {}
-        client = mqtt.Client(userdata=userdata)
-        client.on_connect = on_connect
-        client.on_subscribe = on_subscribe
-        
-        try:
-            # Connect to broker
-            client.connect(BROKER, PORT, 60)
-            client.loop_start()
-            time.sleep(0.5)  # Wait for connection
-            
-            # Subscribe and measure time
-            start_time = time.time()
-            result, mid = client.subscribe(TEST_TOPIC, qos=1)
-            
-            # Wait for SUBACK
-            timeout = start_time + (TIMEOUT_MS / 1000.0)
-            while 'subscribe_time' not in userdata and time.time() < timeout:
-                time.sleep(0.01)
-            
-            elapsed_ms = (time.time() - start_time) * 1000
-            
-            # Check results
-            if 'subscribe_time' in userdata:
-                granted_qos = userdata['granted_qos']
-                if elapsed_ms <= TIMEOUT_MS and granted_qos >= 0:
-                    print(f"  ✅ Test {i}/{TEST_RUNS} PASS: SUBACK in {elapsed_ms:.1f}ms, QoS={granted_qos}")
-                    passed += 1
-                    test_results.append('PASS')
+    # One connection for the whole run; each test is a SUBSCRIBE/UNSUBSCRIBE pair
+    userdata = {'connected': threading.Event(), 'lock': threading.Lock(), 'events': {}, 'acks': {}}
+    client = mqtt.Client(userdata=userdata)
+    client.on_connect = on_connect
+    client.on_subscribe = on_subscribe
+    client.on_socket_open = set_tcp_nodelay
+    
+    try:
+        client.connect(BROKER, PORT, 60)
+    except Exception as e:
+        print(f"❌ Could not connect to broker {BROKER}:{PORT}: {e}")
+        sys.exit(1)
+    
+    client.loop_start()
+    if not userdata['connected'].wait(timeout=5):
+        print(f"❌ Could not connect to broker {BROKER}:{PORT}")
+        client.loop_stop()
+        client.disconnect()
+        sys.exit(1)
+    
+    try:
+        for i in range(1, TEST_RUNS + 1):
+            try:
+                # Subscribe and measure time
+                event = threading.Event()
+                with userdata['lock']:
+                    start_time = time.monotonic()
+                    result, mid = client.subscribe(TEST_TOPIC, qos=1)
+                    userdata['events'][mid] = event
+                
+                # Wait for SUBACK
+                event.wait(TIMEOUT_MS / 1000.0)
+                with userdata['lock']:
+                    userdata['events'].pop(mid, None)
+                    ack = userdata['acks'].pop(mid, None)
+                
+                # Check results
+                if ack:
+                    subscribe_time, granted_qos = ack
+                    elapsed_ms = (subscribe_time - start_time) * 1000
+                    if elapsed_ms <= TIMEOUT_MS and granted_qos >= 0:
+                        print(f"  ✅ Test {i}/{TEST_RUNS} PASS: SUBACK in {elapsed_ms:.1f}ms, QoS={granted_qos}")
+                        passed += 1
+                        test_results.append('PASS')
+                    else:
+                        print(f"  ❌ Test {i}/{TEST_RUNS} FAIL: SUBACK in {elapsed_ms:.1f}ms (>{TIMEOUT_MS}ms)")
+                        failed += 1
+                        test_results.append('FAIL')
                 else:
-                    print(f"  ❌ Test {i}/{TEST_RUNS} FAIL: SUBACK in {elapsed_ms:.1f}ms (>{TIMEOUT_MS}ms)")
+                    print(f"  ❌ Test {i}/{TEST_RUNS} FAIL: No SUBACK received within {TIMEOUT_MS}ms")
                     failed += 1
                     test_results.append('FAIL')
-            else:
-                print(f"  ❌ Test {i}/{TEST_RUNS} FAIL: No SUBACK received within {TIMEOUT_MS}ms")
+                
+                client.unsubscribe(TEST_TOPIC)
+                
+            except Exception as e:
+                print(f"  ❌ Test {i}/{TEST_RUNS} FAIL: {e}")
                 failed += 1
                 test_results.append('FAIL')
-            
-            client.loop_stop()
-            client.disconnect()
-            time.sleep(0.1)
-            
-        except Exception as e:
-            print(f"  ❌ Test {i}/{TEST_RUNS} FAIL: {e}")
-            failed += 1
-            test_results.append('FAIL')
-            try:
-                client.loop_stop()
-                client.disconnect()
-            except:
-                pass
+    finally:
+        client.loop_stop()
+        client.disconnect()
     
     # Print summary
-    print("\n" + "="*60)
-    print("TEST SUMMARY")
-    print("="*60)
-    success_rate = (passed / TEST_RUNS) * 100
-    print(f"Passed: {passed}/{TEST_RUNS}")
-    print(f"Failed: {failed}/{TEST_RUNS}")
-    print(f"Success Rate: {success_rate:.1f}%")
-    print(f"\nTolerance: {passed} out of {TEST_RUNS} test cases, achieved {success_rate:.1f}% success")
+    summarize(passed, failed)
     
     print("\n" + "="*60)
     print("MQTT-SN CLIENT VERIFICATION")
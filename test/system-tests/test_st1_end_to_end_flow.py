@@ -7,6 +7,7 @@ Tests complete message flow from publisher Pico through gateway and broker to su
 import paho.mqtt.client as mqtt
 import time
 import sys
+import threading
 import random
 import string
 
@@ -21,6 +22,7 @@ TIMEOUT_SEC = 10  # 5-10 seconds requirement (using max)
 # Test results
 test_results = []
 messages_received = {}
+message_event = threading.Event()  # set by on_message
 
 def generate_test_payload():
     """Generate random sensor-like data"""
@@ -44,9 +46,10 @@ def on_connect_subscriber(client, userdata, flags, rc):
 
 def on_message(client, userdata, msg):
     """Callback when subscriber receives message"""
-    timestamp = time.time()
+    timestamp = time.monotonic()
     payload = msg.payload.decode('utf-8')
     messages_received[payload] = timestamp
+    message_event.set()
     print(f"📥 Received: {payload[:50]}... on {msg.topic}")
 
 def run_test():
@@ -94,19 +97,20 @@ def run_test():
         
         for i in range(1, TEST_RUNS + 1):
             messages_received.clear()
+            message_event.clear()
             
             # Generate test payload
             test_payload = generate_test_payload()
             
             # Publish message (simulates Pico #1)
-            send_time = time.time()
+            send_time = time.monotonic()
             publisher.publish(PUBLISH_TOPIC, test_payload, qos=1)
             
             # Wait for message to arrive at subscriber (simulates Pico #2)
             timeout = send_time + TIMEOUT_SEC
             received = False
             
-            while time.time() < timeout:
+            while True:
                 if test_payload in messages_received:
                     receive_time = messages_received[test_payload]
                     latency = receive_time - send_time
@@ -117,8 +121,14 @@ def run_test():
                         passed += 1
                         test_results.append('PASS')
                         received = True
-                        break
-                time.sleep(0.05)
+                    break
+                
+                # Sleep until on_message fires instead of polling every 50 ms
+                remaining = timeout - time.monotonic()
+                if remaining <= 0:
+                    break
+                message_event.wait(remaining)
+                message_event.clear()
             
             if not received:
                 print(f"  ❌ Test {i}/{TEST_RUNS} FAIL: No message received within {TIMEOUT_SEC}s")
@@ -50,7 +50,7 @@ def on_message(client, userdata, msg):
             if len(parts) >= 2:
                 msg_id = int(parts[1])
                 with lock:
-                    messages_received[msg_id] = time.time()
+                    messages_received[msg_id] = time.monotonic()
     except Exception as e:
         print(f"⚠️  Error parsing message: {e}")
 
@@ -95,7 +95,7 @@ def run_test():
         print("Starting performance test...")
         print("="*70 + "\n")
         
-        start_time = time.time()
+        start_time = time.monotonic()
         message_interval = 1.0 / MESSAGES_PER_SECOND  # 0.2 seconds
         
         # Send messages at specified rate
@@ -104,7 +104,7 @@ def run_test():
             payload = f"PERF_MSG:{msg_id}:{time.time()}:DATA"
             
             # Send message
-            send_time = time.time()
+            send_time = time.monotonic()
             with lock:
                 messages_sent[msg_id] = send_time
             
@@ -112,7 +112,7 @@ def run_test():
             
             # Progress update every 30 messages
             if msg_id % 30 == 0:
-                elapsed = time.time() - start_time
+                elapsed = time.monotonic() - start_time
                 rate = msg_id / elapsed
                 with lock:
                     received_count = len(messages_received)
@@ -123,7 +123,7 @@ def run_test():
             
             # Wait for next interval
             next_send = start_time + (msg_id * message_interval)
-            sleep_time = next_send - time.time()
+            sleep_time = next_send - time.monotonic()
             if sleep_time > 0:
                 time.sleep(sleep_time)
         
@@ -132,7 +132,7 @@ def run_test():
         time.sleep(10)
         
         # Calculate results
-        end_time = time.time()
+        end_time = time.monotonic()
         total_duration = end_time - start_time
         
         with lock:
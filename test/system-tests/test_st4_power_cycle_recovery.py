@@ -8,6 +8,7 @@ Expected: Reconnect and restore session within <= 15 seconds
 import paho.mqtt.client as mqtt
 import time
 import sys
+import threading
 
 # Test configuration
 BROKER = "localhost"
@@ -18,7 +19,7 @@ RECONNECT_TIMEOUT_SEC = 15  # <= 15 seconds requirement
 
 # Test results
 test_results = []
-message_received = False
+message_event = threading.Event()  # set by on_message
 
 def on_connect(client, userdata, flags, rc):
     if rc == 0:
@@ -29,22 +30,14 @@ def on_connect(client, userdata, flags, rc):
 
 def on_message(client, userdata, msg):
     """Callback when message is received from Pico"""
-    global message_received
     payload = msg.payload.decode('utf-8')
     print(f"📥 Received from Pico: {payload[:60]}...")
-    message_received = True
+    message_event.set()
 
 def wait_for_pico_message(client, timeout_sec):
     """Wait for a message from Pico to confirm it's operational"""
-    global message_received
-    message_received = False
-    
-    start_time = time.time()
-    while time.time() - start_time < timeout_sec:
-        if message_received:
-            return True
-        time.sleep(0.1)
-    return False
+    message_event.clear()
+    return message_event.wait(timeout=timeout_sec)
 
 def run_test():
     """Run ST4 power cycle recovery test"""
@@ -109,11 +102,11 @@ def run_test():
             
             # Step 3: Measure recovery time
             print("\n⏱  Step 3: Measuring reconnection time...")
-            recovery_start = time.time()
+            recovery_start = time.monotonic()
             
             # Wait for Pico to reconnect and publish
             if wait_for_pico_message(client, RECONNECT_TIMEOUT_SEC):
-                recovery_time = time.time() - recovery_start
+                recovery_time = time.monotonic() - recovery_start
                 total_recovery_time += recovery_time
                 
                 if recovery_time <= RECONNECT_TIMEOUT_SEC:
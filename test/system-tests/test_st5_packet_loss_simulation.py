@@ -10,7 +10,7 @@ Tests QoS behavior under simulated UDP packet loss conditions
 import paho.mqtt.client as mqtt
 import time
 import sys
-import subprocess
+import shutil
 import platform
 
 # Test configuration
@@ -59,14 +59,10 @@ def check_packet_loss_tools():
     print("🔍 Checking for packet loss simulation tools...")
     
     if system == "Linux":
-        # Check for tc (traffic control)
-        try:
-            result = subprocess.run(['which', 'tc'], capture_output=True, text=True)
-            if result.returncode == 0:
-                print("   ✅ 'tc' (traffic control) available")
-                return "tc"
-        except:
-            pass
+        # Check for tc (traffic control) - PATH lookup, no subprocess
+        if shutil.which('tc'):
+            print("   ✅ 'tc' (traffic control) available")
+            return "tc"
     
     print("   ⚠️  No automated packet loss tools detected")
     print("   Manual packet loss simulation required")
@@ -42,12 +42,12 @@ class GatewayObserver:
         Returns: List of packet info dicts
         """
         packets = []
-        start_time = time.time()
+        start_time = time.monotonic()
         
-        while (time.time() - start_time) < timeout_sec:
+        while (time.monotonic() - start_time) < timeout_sec:
             try:
                 data, addr = self.sock.recvfrom(1024)
-                elapsed = time.time() - start_time
+                elapsed = time.monotonic() - start_time
                 
                 packet_info = {
                     'data': data,
@@ -338,7 +338,8 @@ class MQTTSNGatewayClient:
     def recv_packet(self, timeout: float = 0.5) -> bytes:
         """Receive packet from gateway"""
         try:
-            self.sock.settimeout(timeout)
+            if self.sock.gettimeout() != timeout:
+                self.sock.settimeout(timeout)
             data, _ = self.sock.recvfrom(1024)
             return data
         except socket.timeout:
@@ -378,7 +379,10 @@ class SimpleUDPServer:
     def recv(self, timeout: float = 1.0) -> Optional[Tuple[bytes, Tuple[str, int]]]:
         """Receive UDP packet"""
         try:
-            self.sock.settimeout(timeout)
+            # Only touch the socket when the timeout changes; callers poll
+            # with the same value every iteration
+            if self.sock.gettimeout() != timeout:
+                self.sock.settimeout(timeout)
             data, addr = self.sock.recvfrom(1024)
             return data, addr
         except socket.timeout:
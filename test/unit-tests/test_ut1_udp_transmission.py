@@ -63,12 +63,12 @@ class TestUT1_UDPTransmission:
         print(f"→ Collecting {iterations} packets from Pico...\n")
         
         try:
-            start_time = time.time()
+            start_time = time.monotonic()
             packets_received: List[dict] = []
             first_payload = None
             
             # Collect up to 'iterations' packets
-            while (time.time() - start_time) < timeout_sec and len(packets_received) < iterations:
+            while (time.monotonic() - start_time) < timeout_sec and len(packets_received) < iterations:
                 result = self.server.recv(timeout=1.0)
                 
                 if result:
@@ -108,10 +108,10 @@ class TestUT2_TimeoutHandling:
             print(f"Port unblocked!")
             print(f"Listening for reconnection attempts ({listen_after}s)...\n")
             
-            start_time = time.time()
+            start_time = time.monotonic()
             reconnection_packets = []
             
-            while (time.time() - start_time) < listen_after:
+            while (time.monotonic() - start_time) < listen_after:
                 result = server.recv(timeout=1.0)
                 
                 if result:
@@ -118,7 +118,7 @@ class TestUT3_MicroSDPerformance:
         print("   (This takes a while - packets arrive every 10s)\n")
         
         try:
-            start_time = time.time()
+            start_time = time.monotonic()
             all_timings = {
                 '512B_read': [],
                 '512B_write': [],
@@ -128,13 +128,13 @@ class TestUT3_MicroSDPerformance:
             
             packets_received = 0
             
-            while (time.time() - start_time) < timeout_sec:
+            while (time.monotonic() - start_time) < timeout_sec:
                 result = server.recv(timeout=1.0)
                 
                 if result:
                     data, addr = result
                     packets_received += 1
-                    elapsed = time.time() - start_time
+                    elapsed = time.monotonic() - start_time
                     
                     try:
                         payload_str = data.decode('utf-8', errors='ignore')